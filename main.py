@@ -1,11 +1,18 @@
 import os
 import json
+import time
+import socket
+import sqlite3
 import logging
+import functools
+import contextlib
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from typing import List, Set, Dict
+from typing import List, Dict, Tuple, Optional, FrozenSet
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
+import aiohttp
 import discord
 from discord.ext import commands
 
@@ -13,9 +20,9 @@ from discord.ext import commands
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")  # 必須
 
 # 監視テキストch（複数可）
-SOURCE_TEXT_CHANNEL_IDS = [
+SOURCE_TEXT_CHANNEL_IDS: FrozenSet[int] = frozenset(
     int(x.strip()) for x in os.getenv("SOURCE_TEXT_CHANNEL_IDS", "").split(",") if x.strip().isdigit()
-]
+)
 
 # ロールID
 MALE_ROLE_ID = int(os.getenv("MALE_ROLE_ID", "1399390214295785623"))
@@ -25,11 +32,14 @@ FEMALE_ROLE_ID = int(os.getenv("FEMALE_ROLE_ID", "1399390384756363264"))
 def parse_id_list(env_name: str) -> List[int]:
     return [int(x.strip()) for x in os.getenv(env_name, "").split(",") if x.strip().isdigit()]
 
-MALE_FORUM_IDS: List[int] = parse_id_list("MALE_FORUM_IDS")
-FEMALE_FORUM_IDS: List[int] = parse_id_list("FEMALE_FORUM_IDS")
-DEFAULT_FORUM_IDS: List[int] = parse_id_list("DEFAULT_FORUM_IDS")  # 任意
+MALE_FORUM_IDS: Tuple[int, ...] = tuple(parse_id_list("MALE_FORUM_IDS"))
+FEMALE_FORUM_IDS: Tuple[int, ...] = tuple(parse_id_list("FEMALE_FORUM_IDS"))
+DEFAULT_FORUM_IDS: Tuple[int, ...] = tuple(parse_id_list("DEFAULT_FORUM_IDS"))  # 任意
+ALL_FORUM_IDS: FrozenSet[int] = frozenset(MALE_FORUM_IDS + FEMALE_FORUM_IDS + DEFAULT_FORUM_IDS)
 
-# スレッドリンク保存先（JSON）
+# スレッドリンク保存先（SQLite）
+THREAD_LINKS_DB = os.getenv("THREAD_LINKS_DB", "data/thread_links.db")
+# 旧形式（JSON）。存在すれば起動時に DB へ移行する
 THREAD_LINKS_FILE = os.getenv("THREAD_LINKS_FILE", "data/thread_links.json")
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -47,88 +57,273 @@ intents.guilds = True
 intents.messages = True           # on_message 用
 intents.members = True            # ロール判定（Dev Portal で Server Members Intent をON）
 intents.message_content = False   # 内容は使わない
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+class ForumBot(commands.Bot):
+    async def login(self, token: str):
+        # HTTP セッションは login 時に作られるので、その前にコネクタを差し込む
+        # （DNS キャッシュを長めに・keep-alive を延ばして並列 REST で接続を使い回す）
+        # limit=0 / AF_INET は discord.py の既定と同じ（Discord は IPv6 非対応）
+        self.http.connector = aiohttp.TCPConnector(
+            limit=0, family=socket.AF_INET, ttl_dns_cache=600, keepalive_timeout=75
+        )
+        await super().login(token)
+
+    async def setup_hook(self):
+        # on_ready は再接続のたびに呼ばれるため、読み込みは起動時 1 回だけ行う
+        await load_links()
+
+    async def close(self):
+        await super().close()
+        await close_links()
+
+# 使うのは on_message で届く message.author（ロール付き Member）だけなので、
+# メンバーキャッシュと起動時のチャンク取得は無効にする
+bot = ForumBot(
+    command_prefix="!",
+    intents=intents,
+    chunk_guilds_at_startup=False,
+    member_cache_flags=discord.MemberCacheFlags.none(),
+)
 
 JST = ZoneInfo("Asia/Tokyo")
 
 # ========= 永続化（メッセージ→スレッド紐付け） =========
-_links_lock = asyncio.Lock()
-# 形式: { "<message_id>": [<thread_id>, ...] }
-_links: Dict[str, List[int]] = {}
+# SQLite (WAL) に 1 行ずつ保存する。接続は専用スレッド 1 本からのみ触る。
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="links-db")
+_db: Optional[sqlite3.Connection] = None
 
 def _ensure_dir(path: str):
     dirpath = os.path.dirname(path)
     if dirpath:
         os.makedirs(dirpath, exist_ok=True)
 
-def load_links():
-    global _links
+async def _run_db(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, fn, *args)
+
+def _migrate_legacy_json(conn: sqlite3.Connection):
+    """旧形式（JSON）のリンクファイルがあれば DB へ取り込む。"""
+    if not os.path.exists(THREAD_LINKS_FILE):
+        return
     try:
-        if os.path.exists(THREAD_LINKS_FILE):
-            with open(THREAD_LINKS_FILE, "r", encoding="utf-8") as f:
-                _links = json.load(f)
-        else:
-            _links = {}
+        with open(THREAD_LINKS_FILE, "r", encoding="utf-8") as f:
+            links = json.load(f)
+        # 行の変換・検証もここで済ませ、壊れた項目は丸ごと読み飛ばす
+        rows: List[Tuple[int, int]] = []
+        skipped = 0
+        for mid, tids in links.items():
+            if not isinstance(tids, list):
+                skipped += 1
+                continue
+            try:
+                entry_rows = [(int(mid), int(tid)) for tid in tids]
+            except (ValueError, TypeError):
+                skipped += 1
+                continue
+            rows.extend(entry_rows)
+        if skipped:
+            log.warning("旧リンクファイルの不正な項目 %d 件を読み飛ばしました。", skipped)
     except Exception:
-        log.exception("リンクファイルの読み込みに失敗しました。初期化します。")
-        _links = {}
-
-def save_links():
-    _ensure_dir(THREAD_LINKS_FILE)
+        log.exception("旧リンクファイルの読み込みに失敗しました。移行をスキップします。")
+        return
+    conn.execute("BEGIN")
     try:
-        with open(THREAD_LINKS_FILE, "w", encoding="utf-8") as f:
-            json.dump(_links, f, ensure_ascii=False, indent=2)
+        conn.executemany("INSERT OR IGNORE INTO links VALUES (?, ?)", rows)
+        conn.execute("COMMIT")
     except Exception:
-        log.exception("リンクファイルの保存に失敗しました。")
+        # 旧ファイルは残したままにして、次回起動時に再試行する
+        conn.execute("ROLLBACK")
+        log.exception("旧リンクファイルの移行に失敗しました。")
+        return
+    os.replace(THREAD_LINKS_FILE, THREAD_LINKS_FILE + ".migrated")
+    log.info("旧リンクファイルから %d 件のリンクを移行しました。", len(rows))
+
+def _open_db():
+    global _db
+    _ensure_dir(THREAD_LINKS_DB)
+    conn = sqlite3.connect(THREAD_LINKS_DB, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS links ("
+        " message_id INTEGER NOT NULL,"
+        " thread_id INTEGER NOT NULL,"
+        " PRIMARY KEY (message_id, thread_id))"
+    )
+    _migrate_legacy_json(conn)
+    _db = conn
+
+def _close_db():
+    global _db
+    if _db is not None:
+        _db.close()
+        _db = None
+
+def _db_add(message_id: int, thread_ids: List[int]):
+    # 複数行でも 1 トランザクション（= 1 回のコミット）にまとめる
+    _db.execute("BEGIN")
+    try:
+        _db.executemany(
+            "INSERT OR IGNORE INTO links VALUES (?, ?)", ((message_id, tid) for tid in thread_ids)
+        )
+        _db.execute("COMMIT")
+    except Exception:
+        # 開いたままだと以後の BEGIN が全て失敗し、pop_links の DELETE も未コミットのまま溜まる
+        _db.execute("ROLLBACK")
+        raise
+
+def _db_pop(message_id: int) -> List[int]:
+    rows = _db.execute(
+        "DELETE FROM links WHERE message_id = ? RETURNING thread_id", (message_id,)
+    ).fetchall()
+    return [r[0] for r in rows]
+
+async def load_links():
+    await _run_db(_open_db)
 
-async def add_link(message_id: int, thread_id: int):
-    async with _links_lock:
-        key = str(message_id)
-        _links.setdefault(key, [])
-        if thread_id not in _links[key]:
-            _links[key].append(thread_id)
-            save_links()
+async def close_links():
+    await _run_db(_close_db)
+
+async def add_links(message_id: int, thread_ids: List[int]):
+    if thread_ids:
+        await _run_db(_db_add, message_id, thread_ids)
 
 async def pop_links(message_id: int) -> List[int]:
     """削除時に対応スレッドID群を取り出す（なければ空）。"""
-    async with _links_lock:
-        key = str(message_id)
-        ids = _links.pop(key, [])
-        if ids:
-            save_links()
-        return ids
+    return await _run_db(_db_pop, message_id)
+
+# ========= アーカイブ検索キャッシュ =========
+# archived_threads は REST のページングなので、結果を一定時間キャッシュする
+ARCHIVE_CACHE_TTL = 300.0  # 秒
+# アーカイブ検索は最大件数と期間で打ち切る（スレ名の期日は投稿日+10日なので、それより古いものは見ない）
+ARCHIVE_SCAN_LIMIT = 50
+ARCHIVE_SCAN_WINDOW = timedelta(days=11)
+ARCHIVE_CACHE_MAX = 4096
+# 形式: { (forum_id, display_name): (取得時刻, Thread または None) }。挿入順 = 取得時刻順
+_archive_cache: Dict[Tuple[int, str], Tuple[float, Optional[discord.Thread]]] = {}
+
+def _archive_cache_get(key: Tuple[int, str]) -> Tuple[bool, Optional[discord.Thread]]:
+    """(ヒットしたか, Thread) を返す。None は「スレ無し」のネガティブキャッシュ。"""
+    entry = _archive_cache.get(key)
+    if entry is None:
+        return False, None
+    cached_at, thread = entry
+    if time.monotonic() - cached_at > ARCHIVE_CACHE_TTL:
+        del _archive_cache[key]
+        return False, None
+    return True, thread
+
+def _archive_cache_set(key: Tuple[int, str], thread: Optional[discord.Thread]):
+    now = time.monotonic()
+    # 末尾に積み直して取得時刻順を保つ
+    _archive_cache.pop(key, None)
+    _archive_cache[key] = (now, thread)
+    # 先頭（古い順）から、期限切れ or 上限超過の分を捨てる
+    while _archive_cache:
+        oldest_key, (cached_at, _) = next(iter(_archive_cache.items()))
+        if len(_archive_cache) <= ARCHIVE_CACHE_MAX and now - cached_at <= ARCHIVE_CACHE_TTL:
+            break
+        del _archive_cache[oldest_key]
+
+def _archive_cache_forget(thread_ids: List[int]):
+    """削除されたスレッドを指すエントリを破棄する。"""
+    targets = set(thread_ids)
+    for key in [k for k, (_, t) in _archive_cache.items() if t is not None and t.id in targets]:
+        del _archive_cache[key]
+
+# ========= フォーラム別スレッド索引 =========
+# 形式: { forum_id: { display_name: thread_id } }
+_forum_index: Dict[int, Dict[str, int]] = {}
+
+def _user_of_thread_name(thread_name: str) -> Optional[str]:
+    """「ユーザー名/月/日」からユーザー名を取り出す（形式外なら None）"""
+    parts = thread_name.rsplit("/", 2)
+    if len(parts) != 3 or not parts[0]:
+        return None
+    return parts[0]
+
+def index_thread(thread: discord.Thread):
+    # 対象フォーラム以外（テキストchのスレッド等）は引かれないので登録しない
+    if thread.parent_id not in ALL_FORUM_IDS:
+        return
+    display_name = _user_of_thread_name(thread.name)
+    if display_name is None:
+        return
+    _forum_index.setdefault(thread.parent_id, {}).setdefault(display_name, thread.id)
+
+def unindex_thread(thread_id: int, forum_id: Optional[int] = None):
+    forum_ids = [forum_id] if forum_id is not None else list(_forum_index)
+    for fid in forum_ids:
+        users = _forum_index.get(fid)
+        if not users:
+            continue
+        for name in [n for n, tid in users.items() if tid == thread_id]:
+            del users[name]
+
+def seed_forum_index(guild: discord.Guild):
+    """起動時に対象フォーラムのアクティブスレッドを一括登録"""
+    for fid in ALL_FORUM_IDS:
+        forum = guild.get_channel(fid)
+        if isinstance(forum, discord.ForumChannel):
+            for t in forum.threads:
+                index_thread(t)
 
 # ========= ユーティリティ =========
+THREAD_DUE_DAYS = 10
+# JST は夏時間の無い固定 +09:00 なので、タイムゾーン DB を引かずに秒数を足すだけで済ませる
+_DUE_SHIFT_S = THREAD_DUE_DAYS * 86400 + 9 * 3600
+
+@functools.lru_cache(maxsize=4096)
+def _date_label(epoch_min: int) -> str:
+    """分単位の投稿時刻 → 期日ラベル（例: 8/20）。同じ分の投稿は同じ結果になるのでキャッシュする。"""
+    due = time.gmtime(epoch_min * 60 + _DUE_SHIFT_S)
+    return f"{due.tm_mon}/{due.tm_mday}"
+
 def make_thread_name(display_name: str, base_time: datetime) -> str:
     """スレッド名: ユーザー名/月/日（投稿日+10日基準）"""
-    due = (base_time + timedelta(days=10)).astimezone(JST)
-    date_label = f"{due.month}/{due.day}"  # 例: 8/20
-    return f"{display_name}/{date_label}"[:95]
-
-def name_belongs_to_user(thread_name: str, display_name: str) -> bool:
-    # 「ユーザー名/xxxx」で始まっていれば同一ユーザー扱い
-    return thread_name.startswith(f"{display_name}/")
+    return f"{display_name}/{_date_label(int(base_time.timestamp()) // 60)}"[:95]
 
 async def find_existing_user_thread(forum: discord.ForumChannel, display_name: str) -> discord.Thread | None:
     """同ユーザー名先頭のスレッドがそのフォーラムにあるか（アクティブ＋アーカイブ）"""
-    # アクティブ
+    # 索引（O(1)）。ギルドのキャッシュにあるアクティブなスレッドだけを信用する。
+    # 無ければ削除済み（見逃した削除イベント）かアーカイブ済みなので、索引から外して下の確認に回す
+    thread_id = _forum_index.get(forum.id, {}).get(display_name)
+    if thread_id is not None:
+        thread = forum.guild.get_thread(thread_id)
+        if thread is not None:
+            return thread
+        unindex_thread(thread_id, forum.id)
+    # 「ユーザー名/xxxx」で始まっていれば同一ユーザー扱い（接頭辞はループ外で 1 回だけ作る）
+    prefix = display_name + "/"
+    # アクティブ（キャッシュ済みなので REST 不要）
     for t in forum.threads:
-        if name_belongs_to_user(t.name, display_name):
+        if t.name.startswith(prefix):
+            index_thread(t)
             return t
-    # アーカイブ済み（※ private 引数は不要）
+    # アーカイブ済みは TTL キャッシュを優先
+    key = (forum.id, display_name)
+    hit, cached = _archive_cache_get(key)
+    if hit:
+        return cached
+    # アーカイブ済み（※ private 引数は不要）。新しくアーカイブされた順に返るので、期間外に達したら打ち切る
+    cutoff = discord.utils.utcnow() - ARCHIVE_SCAN_WINDOW
     try:
-        async for t in forum.archived_threads(limit=200):
-            if name_belongs_to_user(t.name, display_name):
+        async for t in forum.archived_threads(limit=ARCHIVE_SCAN_LIMIT):
+            if t.archive_timestamp < cutoff:
+                break
+            if t.name.startswith(prefix):
+                _archive_cache_set(key, t)
                 return t
     except Exception:
         log.exception("archived_threads の取得に失敗しました。")
+        return None
+    _archive_cache_set(key, None)
     return None
 
-def gather_target_forums(guild: discord.Guild, member: discord.Member) -> List[discord.ForumChannel]:
-    """メンバーのロールに応じて、作成先フォーラム（複数）を収集"""
-    has_male = any(r.id == MALE_ROLE_ID for r in member.roles)
-    has_female = any(r.id == FEMALE_ROLE_ID for r in member.roles)
-
+# 作成先フォーラム ID はロールの組み合わせだけで決まるのでキャッシュする。
+# Channel オブジェクトは READY / GUILD_CREATE のたびに作り直されるため、ID だけを持って毎回引き直す
+@functools.lru_cache(maxsize=None)
+def _target_forum_ids(has_male: bool, has_female: bool) -> Tuple[int, ...]:
     id_candidates: List[int] = []
     if has_male:
         id_candidates += MALE_FORUM_IDS
@@ -136,26 +331,112 @@ def gather_target_forums(guild: discord.Guild, member: discord.Member) -> List[d
         id_candidates += FEMALE_FORUM_IDS
     if not id_candidates:
         id_candidates += DEFAULT_FORUM_IDS
+    # 順序を保ったまま重複除去
+    return tuple(dict.fromkeys(id_candidates))
 
-    # 重複除去しつつ、ForumChannel のみ返す
-    seen: Set[int] = set()
+def gather_target_forums(guild: discord.Guild, member: discord.Member) -> List[discord.ForumChannel]:
+    """メンバーのロールに応じて、作成先フォーラム（複数）を収集"""
+    # get_role はロール ID 列の二分探索 + guild.get_role の dict 引きで済み、roles を線形走査しない
+    has_male = member.get_role(MALE_ROLE_ID) is not None
+    has_female = member.get_role(FEMALE_ROLE_ID) is not None
+
+    # ForumChannel のみ返す
     forums: List[discord.ForumChannel] = []
-    for fid in id_candidates:
-        if fid in seen:
-            continue
-        seen.add(fid)
+    for fid in _target_forum_ids(has_male, has_female):
         ch = guild.get_channel(fid)
         if isinstance(ch, discord.ForumChannel):
             forums.append(ch)
     return forums
 
+# 形式: { (forum_id, member_id): Lock } と、その Lock を使用中（保持・待機）の数
+_create_locks: Dict[Tuple[int, int], asyncio.Lock] = {}
+_create_lock_users: Dict[Tuple[int, int], int] = {}
+
+@contextlib.asynccontextmanager
+async def _create_lock(key: Tuple[int, int]):
+    """キー単位の Lock。使用者がいなくなった時点で破棄するので辞書は膨らまない。"""
+    lock = _create_locks.get(key)
+    if lock is None:
+        lock = _create_locks[key] = asyncio.Lock()
+    _create_lock_users[key] = _create_lock_users.get(key, 0) + 1
+    try:
+        async with lock:
+            yield
+    finally:
+        _create_lock_users[key] -= 1
+        if not _create_lock_users[key]:
+            del _create_lock_users[key]
+            del _create_locks[key]
+
+async def _handle_forum(
+    forum: discord.ForumChannel,
+    message: discord.Message,
+    member: discord.Member,
+    display_name: str,
+    thread_name: str,
+    content: str,
+) -> Optional[int]:
+    """1 フォーラム分の処理。スレッドを作成したらその ID を返す。"""
+    try:
+        # 同じ人の連投で「確認→作成」が並走すると二重作成になるので、(フォーラム, メンバー) 単位で直列化する
+        async with _create_lock((forum.id, member.id)):
+            # フォーラムごとに「同ユーザー名先頭のスレ」が既にあるか確認
+            existing = await find_existing_user_thread(forum, display_name)
+            if existing:
+                log.info("[Skip] 既存スレあり: %s (forum: %s)", existing.name, forum.name)
+                return None
+
+            created = await forum.create_thread(
+                name=thread_name,
+                content=content,
+                reason=f"Triggered by message in #{message.channel.name} from {member} ({member.id})",
+            )
+            # create_thread は ThreadWithMessage を返す → thread を取り出す
+            thread_obj = created.thread if hasattr(created, "thread") else created
+            # 次回の同ユーザー投稿で REST を叩かないよう、作成したスレを登録
+            _archive_cache_set((forum.id, display_name), thread_obj)
+            _forum_index.setdefault(forum.id, {})[display_name] = thread_obj.id
+
+            log.info("[OK] Created thread: %s (ID: %s) in forum '%s'", thread_obj.name, thread_obj.id, forum.name)
+            return thread_obj.id
+    except discord.Forbidden:
+        log.exception("[NG] 権限不足で作成失敗: forum '%s'", forum.name)
+    except discord.HTTPException:
+        log.exception("[NG] HTTPエラーで作成失敗: forum '%s'", forum.name)
+    except Exception:
+        log.exception("[NG] 想定外のエラー: forum '%s'", forum.name)
+    return None
+
+# 同時に走らせるスレッド削除の上限（Discord のルート別レート制限に配慮）
+_delete_sem = asyncio.Semaphore(4)
+
+async def _delete_thread(tid: int, msg_id: int):
+    async with _delete_sem:
+        try:
+            # 紐付けに入っているのは自分で作ったスレッド ID だけなので、取得せずに ID で直接削除する（REST 1 回）
+            await bot.http.delete_channel(tid, reason=f"Source message {msg_id} deleted; auto-clean thread.")
+            log.info("[OK] Deleted thread %s due to source message deletion.", tid)
+        except discord.NotFound:
+            log.info("[Skip] Thread %s not found (already deleted?).", tid)
+        except discord.Forbidden:
+            log.exception("[NG] 権限不足でスレッド削除失敗: thread %s", tid)
+        except discord.HTTPException:
+            log.exception("[NG] HTTPエラーでスレッド削除失敗: thread %s", tid)
+        except Exception:
+            log.exception("[NG] 想定外のエラー: thread %s", tid)
+
 # ========= イベント =========
 @bot.event
 async def on_ready():
-    load_links()
-    log.info(f"Logged in as {bot.user} (ID: {bot.user.id})")
-    log.info(f"監視対象テキスト: {SOURCE_TEXT_CHANNEL_IDS}")
-    log.info(f"男性フォーラム: {MALE_FORUM_IDS} / 女性フォーラム: {FEMALE_FORUM_IDS} / デフォルト: {DEFAULT_FORUM_IDS}")
+    # 再接続（再 IDENTIFY）後は切断中の削除イベントを取りこぼしている可能性があるので作り直す
+    _forum_index.clear()
+    _archive_cache.clear()
+    for guild in bot.guilds:
+        seed_forum_index(guild)
+    log.info("Logged in as %s (ID: %s)", bot.user, bot.user.id)
+    if log.isEnabledFor(logging.INFO):
+        log.info("監視対象テキスト: %s", sorted(SOURCE_TEXT_CHANNEL_IDS))
+    log.info("男性フォーラム: %s / 女性フォーラム: %s / デフォルト: %s", MALE_FORUM_IDS, FEMALE_FORUM_IDS, DEFAULT_FORUM_IDS)
     if not SOURCE_TEXT_CHANNEL_IDS:
         log.warning("SOURCE_TEXT_CHANNEL_IDS が未設定です。")
 
@@ -164,7 +445,7 @@ async def on_message(message: discord.Message):
     # Bot・DMは無視
     if message.author.bot or message.guild is None:
         return
-    if not SOURCE_TEXT_CHANNEL_IDS or message.channel.id not in SOURCE_TEXT_CHANNEL_IDS:
+    if message.channel.id not in SOURCE_TEXT_CHANNEL_IDS:
         return
 
     member: discord.Member = message.author
@@ -181,30 +462,12 @@ async def on_message(message: discord.Message):
     thread_name = make_thread_name(display_name, base_time)
     content = message.jump_url  # ← リンクのみ
 
-    for forum in forums:
-        try:
-            # フォーラムごとに「同ユーザー名先頭のスレ」が既にあるか確認
-            existing = await find_existing_user_thread(forum, display_name)
-            if existing:
-                log.info(f"[Skip] 既存スレあり: {existing.name} (forum: {forum.name})")
-                continue
-
-            created = await forum.create_thread(
-                name=thread_name,
-                content=content,
-                reason=f"Triggered by message in #{message.channel.name} from {member} ({member.id})",
-            )
-            # create_thread は ThreadWithMessage を返す → thread を取り出す
-            thread_obj = created.thread if hasattr(created, "thread") else created
-            await add_link(message.id, thread_obj.id)
-
-            log.info(f"[OK] Created thread: {thread_obj.name} (ID: {thread_obj.id}) in forum '{forum.name}'")
-        except discord.Forbidden:
-            log.exception(f"[NG] 権限不足で作成失敗: forum '{forum.name}'")
-        except discord.HTTPException:
-            log.exception(f"[NG] HTTPエラーで作成失敗: forum '{forum.name}'")
-        except Exception:
-            log.exception(f"[NG] 想定外のエラー: forum '{forum.name}'")
+    # フォーラムごとの処理は独立した I/O なので並行に実行する
+    results = await asyncio.gather(
+        *(_handle_forum(f, message, member, display_name, thread_name, content) for f in forums),
+        return_exceptions=True,
+    )
+    await add_links(message.id, [tid for tid in results if isinstance(tid, int)])
 
 @bot.event
 async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
@@ -216,21 +479,28 @@ async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
     thread_ids = await pop_links(msg_id)
     if not thread_ids:
         return
-
+    _archive_cache_forget(thread_ids)
     for tid in thread_ids:
-        try:
-            ch = await bot.fetch_channel(tid)  # Thread を取得
-            if isinstance(ch, discord.Thread):
-                await ch.delete(reason=f"Source message {msg_id} deleted; auto-clean thread.")
-                log.info(f"[OK] Deleted thread {tid} due to source message deletion.")
-        except discord.NotFound:
-            log.info(f"[Skip] Thread {tid} not found (already deleted?).")
-        except discord.Forbidden:
-            log.exception(f"[NG] 権限不足でスレッド削除失敗: thread {tid}")
-        except discord.HTTPException:
-            log.exception(f"[NG] HTTPエラーでスレッド削除失敗: thread {tid}")
-        except Exception:
-            log.exception(f"[NG] 想定外のエラー: thread {tid}")
+        unindex_thread(tid)
+
+    await asyncio.gather(*(_delete_thread(tid, msg_id) for tid in thread_ids), return_exceptions=True)
+
+@bot.event
+async def on_thread_create(thread: discord.Thread):
+    index_thread(thread)
+
+@bot.event
+async def on_thread_update(before: discord.Thread, after: discord.Thread):
+    if before.name != after.name:
+        unindex_thread(before.id, before.parent_id)
+        index_thread(after)
+
+@bot.event
+async def on_raw_thread_delete(payload: discord.RawThreadDeleteEvent):
+    """スレッドが（手動などで）削除されたら索引・キャッシュからも外す。
+    on_thread_delete はキャッシュ済みスレッドでしか発火しないため Raw を使う。"""
+    unindex_thread(payload.thread_id, payload.parent_id)
+    _archive_cache_forget([payload.thread_id])
 
 # ========= 起動 =========
 if __name__ == "__main__":